@@ -1,34 +1,355 @@
+import asyncio
+import cachetools
+import hashlib
+import threading
+import time
+import diskcache
 import google.generativeai as genai
 import httpx
 from app.config import settings
 from app.models import Property, VerificationResult
-from typing import Optional
-import json
-import re
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import orjson
 from datetime import datetime
 
+# How long cached Gemini responses stay valid (seconds)
+VERIFY_CACHE_TTL = 7 * 24 * 3600
+ANALYZE_CACHE_TTL = 30 * 24 * 3600
+
+# How long a URL that passed verify_url is trusted without re-checking (seconds)
+URL_OK_TTL = 3600
+
+# How long a host that refused or timed out connections is skipped (seconds)
+HOST_FAILURE_TTL = 30 * 60
+
+# Errors meaning the host itself is unreachable, not just this URL
+HOST_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+# Fields filled in by verification and analysis, copied between coalesced calls
+VERIFIED_FIELDS = (
+    "verification_result", "verification_reason", "funnel_stage", "last_verified_at",
+    "price", "bed_count", "acreage", "score", "ai_summary",
+)
+
+# Batch verification: max properties per Gemini call, and a rough prompt budget
+VERIFY_BATCH_SIZE = 20
+VERIFY_BATCH_MAX_TOKENS = 8000
+
+GEMINI_MODEL = 'gemini-1.5-flash'
+
+# Property descriptions are cut to this length in single-property prompts
+PROMPT_DESCRIPTION_CHARS = 800
+
+# Fixed instructions live in the system prompt so every call shares the same prefix
+VERIFY_SYSTEM = """
+You are a real estate analyst verifying property leads. For each property, determine if it's a viable lead.
+
+Answer these questions:
+1. Is this an ACTUAL LISTING (property for sale/rent) or just a NEWS ARTICLE about a property?
+2. Is the property AVAILABLE (can be purchased) or ALREADY SOLD/ACQUIRED by someone else?
+3. What is the property type? (college, camp, resort, hotel, retreat center, other)
+4. Any red flags that make this NOT a viable lead?
+
+Consider these as NOT available:
+- Properties being acquired by another institution (e.g., "bought by Vanderbilt")
+- Properties already sold/under contract
+- Properties that are closing but not selling the real estate
+- Purely news coverage without sale information
+
+Classification rules:
+- "qualified": Is a listing AND is available
+- "interesting": Is news/article about a property that MIGHT become available
+- "dismissed": Already sold, not a property, or not relevant
+
+property_type is one of: college, camp, resort, hotel, retreat, other.
+extracted_price is formatted like "$X,XXX,XXX".
+"""
+
+ANALYZE_SYSTEM = """
+You are an expert real estate analyst specializing in distressed assets (colleges, camps, resorts).
+Analyze the verified property lead you are given and provide a structured summary.
+
+Task:
+1. Rate the "viability" score (0-100) for turning this into a co-living village for 200+ builders.
+2. Write a one-sentence "punchy" summary of why this is interesting.
+3. Extract any vital stats if apparent from context.
+
+Consider:
+- Capacity (200+ beds needed)
+- Drive time to major airport (<2 hours ideal)
+- Price point
+- Infrastructure condition
+"""
+
+# Allowed values for the enum fields of a verification reply; classification
+# becomes funnel_stage, which the database CHECK constraint restricts
+CLASSIFICATIONS = ("qualified", "interesting", "dismissed")
+PROPERTY_TYPES = ("college", "camp", "resort", "hotel", "retreat", "other")
+
+VERIFY_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "is_listing": {"type": "BOOLEAN"},
+        "is_available": {"type": "BOOLEAN"},
+        "property_type": {"type": "STRING", "format": "enum", "enum": list(PROPERTY_TYPES)},
+        "classification": {"type": "STRING", "format": "enum", "enum": list(CLASSIFICATIONS)},
+        "reason": {"type": "STRING"},
+        "extracted_price": {"type": "STRING", "nullable": True},
+        "extracted_beds": {"type": "INTEGER", "nullable": True},
+        "extracted_acreage": {"type": "NUMBER", "nullable": True},
+    },
+    "required": ["is_listing", "is_available", "classification", "reason"],
+}
+
+ANALYZE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "score": {"type": "INTEGER"},
+        "ai_summary": {"type": "STRING"},
+        "inferred_beds": {"type": "INTEGER", "nullable": True},
+        "inferred_acreage": {"type": "NUMBER", "nullable": True},
+    },
+    "required": ["score", "ai_summary"],
+}
+
+# System instruction and response schema for each kind of Gemini call
+MODEL_SPECS = {
+    "verify": (VERIFY_SYSTEM, VERIFY_SCHEMA),
+    "analyze": (ANALYZE_SYSTEM, ANALYZE_SCHEMA),
+}
+
+# Per-call override for batch verification, which returns one object per property
+VERIFY_BATCH_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {"type": "ARRAY", "items": VERIFY_SCHEMA},
+}
+
+
+def _extract_json(text: str, opener: str = "{") -> Optional[str]:
+    """
+    Return the first balanced JSON object (or array, with opener="[") in text.
+
+    Single linear pass that tracks nesting depth and skips over string
+    literals, so prose after the JSON (even with stray braces) is ignored.
+    """
+    start = text.find(opener)
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "{[":
+            depth += 1
+        elif c in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _parse_json(text: str, opener: str = "{"):
+    """
+    Parse a Gemini JSON response.
+
+    Responses are requested in JSON mode, but cached text from older prompts
+    may wrap the JSON in prose, so fall back to extracting it.
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        raw = _extract_json(text, opener)
+        if raw is None:
+            raise
+        return orjson.loads(raw)
+
+
+async def _limited(sem: asyncio.Semaphore, aw):
+    """Await aw while holding a slot of sem."""
+    async with sem:
+        return await aw
+
+
+async def _gather_or_cancel(*aws) -> list:
+    """
+    Like asyncio.gather, but if one awaitable fails the rest are cancelled
+    and waited for before the error propagates.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4
+
 
 class AnalystAgent:
     def __init__(self):
-        if settings.GEMINI_API_KEY:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-        else:
-            self.model = None
+        # Gemini is configured on first use so read-only workers never pay for it
+        self._models = {}
+        self._model_lock = threading.Lock()
+
+        # Shared client so repeated checks reuse pooled TCP/TLS connections
+        self._http = httpx.AsyncClient(
+            timeout=10.0,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+
+        # url -> future resolved with the verified property, for coalescing
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # URLs that recently passed verify_url; failures aren't cached so they get retried
+        self._url_ok = cachetools.TTLCache(maxsize=10_000, ttl=URL_OK_TTL)
+
+        # host -> time until which it is treated as unreachable
+        self._host_failures: Dict[str, float] = {}
+
+        # Persistent cache of Gemini responses, shared across restarts
+        self._cache = diskcache.Cache(settings.GEMINI_CACHE_DIR)
+        self.cache_stats = {"hits": 0, "misses": 0}
+
+    def _get_model(self, kind: str) -> Optional[genai.GenerativeModel]:
+        """
+        Return the Gemini model for a kind of call ("verify" or "analyze"),
+        creating it on first use. Returns None without an API key.
+        """
+        if kind not in self._models and settings.GEMINI_API_KEY:
+            with self._model_lock:
+                if kind not in self._models:
+                    genai.configure(api_key=settings.GEMINI_API_KEY)
+                    system_instruction, schema = MODEL_SPECS[kind]
+                    self._models[kind] = genai.GenerativeModel(
+                        GEMINI_MODEL,
+                        system_instruction=system_instruction,
+                        generation_config={
+                            "response_mime_type": "application/json",
+                            "response_schema": schema,
+                        },
+                    )
+        return self._models.get(kind)
+
+    async def aclose(self):
+        """Close the shared HTTP client and response cache."""
+        await self._http.aclose()
+        self._cache.close()
+
+    def _cache_key(self, kind: str, prop: Property) -> str:
+        return hashlib.sha256(
+            f"{kind}|{prop.url}|{(prop.description or '')[:500]}".encode()
+        ).hexdigest()
+
+    async def _cached_generate(self, kind: str, prop: Property, prompt: str, ttl: int) -> dict:
+        """
+        Run a Gemini prompt and return the parsed JSON object, reusing a cached
+        response for the same property.
+
+        The key is built from the property's URL and description rather than
+        the full prompt, so rewording the prompt doesn't invalidate the cache.
+        Only responses that parse are cached, so a bad reply is retried.
+        """
+        key = self._cache_key(kind, prop)
+        text = self._cache.get(key)
+        if text is not None:
+            try:
+                data = _parse_json(text)
+                if isinstance(data, dict):
+                    self.cache_stats["hits"] += 1
+                    return data
+            except ValueError:
+                pass
+            # Unusable entry (e.g. cached before replies were checked); regenerate
+            self._cache.delete(key)
+
+        self.cache_stats["misses"] += 1
+        response = await asyncio.to_thread(self._get_model(kind).generate_content, prompt)
+        data = _parse_json(response.text)
+        if not isinstance(data, dict):
+            raise ValueError("response was not a JSON object")
+        self._cache.set(key, orjson.dumps(data).decode(), expire=ttl)
+        return data
 
     async def verify_url(self, url: str) -> tuple[bool, str]:
         """Check if URL is accessible and returns relevant content."""
+        url_accessible, url_status, _ = await self._check_url_cached(url)
+        return url_accessible, url_status
+
+    async def _check_url_cached(self, url: str) -> Tuple[bool, str, bool]:
+        """
+        Check a URL, returning (accessible, status, answered).
+
+        answered is False when no HTTP response was received (host blocked,
+        connection failure, timeout), so the URL's state is unknown.
+        """
+        if url in self._url_ok:
+            return True, "URL accessible", True
+
+        result = await self._check_url(url)
+        if result[0]:
+            self._url_ok[url] = True
+        return result
+
+    async def _check_url(self, url: str) -> Tuple[bool, str, bool]:
+        host = urlparse(url).netloc
+        blocked_until = self._host_failures.get(host)
+        if blocked_until is not None:
+            if time.monotonic() < blocked_until:
+                return False, "Host recently unreachable", False
+            del self._host_failures[host]
+
         try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-                response = await client.head(url)
-                if response.status_code == 200:
-                    return True, "URL accessible"
-                elif response.status_code == 404:
-                    return False, "URL not found (404)"
-                else:
-                    return False, f"HTTP {response.status_code}"
+            try:
+                response = await self._http.head(url)
+            except HOST_ERRORS:
+                raise
+            except httpx.HTTPError:
+                response = None
+            if response is None or response.status_code in (403, 405):
+                # Some servers reject or mishandle HEAD; ask for the first KB
+                # instead, without reading a body the server may send in full
+                async with self._http.stream(
+                    "GET", url, headers={"Range": "bytes=0-1023"}
+                ) as response:
+                    pass
+            if response.status_code in (200, 206):
+                return True, "URL accessible", True
+            elif response.status_code == 404:
+                return False, "URL not found (404)", True
+            else:
+                return False, f"HTTP {response.status_code}", True
+        except HOST_ERRORS as e:
+            # Skip every URL on this host for a while instead of retrying each one
+            self._mark_host_failed(host)
+            return False, f"Error accessing URL: {str(e)}", False
         except Exception as e:
-            return False, f"Error accessing URL: {str(e)}"
+            return False, f"Error accessing URL: {str(e)}", False
+
+    def _mark_host_failed(self, host: str):
+        """Record an unreachable host, dropping entries that have expired."""
+        now = time.monotonic()
+        self._host_failures = {
+            h: until for h, until in self._host_failures.items() if until > now
+        }
+        self._host_failures[host] = now + HOST_FAILURE_TTL
 
     async def verify_property(self, prop: Property) -> Property:
         """
@@ -39,83 +360,66 @@ class AnalystAgent:
         
         Updates and returns the property with verification results.
         """
-        if not self.model:
+        if not self._get_model("verify"):
             print("WARNING: Gemini API key not found. Skipping verification.")
             prop.funnel_stage = "qualified"  # Assume qualified if no verification
             return prop
 
         # First, check if URL is accessible
-        url_accessible, url_status = await self.verify_url(prop.url)
+        url_accessible, url_status, answered = await self._check_url_cached(prop.url)
         
         if not url_accessible:
+            self._mark_invalid_url(prop, url_status, answered)
+            return prop
+
+        return await self._classify_property(prop)
+
+    def _mark_invalid_url(self, prop: Property, url_status: str, answered: bool = True):
+        """
+        Record a failed URL check. Only URLs whose server answered are
+        dismissed; unreachable ones stay visible so they get another look.
+        """
+        prop.verification_reason = url_status
+        prop.last_verified_at = datetime.now()
+        if answered:
             prop.verification_result = "invalid_url"
-            prop.verification_reason = url_status
             prop.funnel_stage = "dismissed"
-            prop.last_verified_at = datetime.now()
-            return prop
+        else:
+            prop.verification_result = "error"
+            prop.funnel_stage = "interesting"  # Default to interesting on error
 
-        # Use Gemini to analyze the content
-        prompt = f"""
-You are a real estate analyst verifying property leads. Analyze this property and determine if it's a viable lead.
+    def _apply_verification(self, prop: Property, data: dict):
+        """Copy a Gemini verification object onto the property."""
+        prop.verification_result = "available" if data.get("is_available") else "not_available"
+        prop.verification_reason = data.get("reason", "")
+        classification = data.get("classification")
+        # Guard replies cached before the schema enum, since the row is written unvalidated
+        prop.funnel_stage = classification if classification in CLASSIFICATIONS else "interesting"
+        prop.last_verified_at = datetime.now()
+        
+        # Update extracted data if available
+        if data.get("extracted_price"):
+            prop.price = data["extracted_price"]
+        if data.get("extracted_beds"):
+            prop.bed_count = data["extracted_beds"]
+        if data.get("extracted_acreage"):
+            prop.acreage = data["extracted_acreage"]
 
+    async def _classify_property(self, prop: Property) -> Property:
+        """Ask Gemini to classify a single property whose URL is reachable."""
+        prompt = f"""
 Property Title: {prop.title}
 URL: {prop.url}
 Source Type: {prop.source_type}
-Description: {prop.description}
-
-Answer these questions:
-1. Is this an ACTUAL LISTING (property for sale/rent) or just a NEWS ARTICLE about a property?
-2. Is the property AVAILABLE (can be purchased) or ALREADY SOLD/ACQUIRED by someone else?
-3. What is the property type? (college, camp, resort, hotel, retreat center, other)
-4. Any red flags that make this NOT a viable lead?
-
-Consider these as NOT available:
-- Properties being acquired by another institution (e.g., "bought by Vanderbilt")
-- Properties already sold/under contract
-- Properties that are closing but not selling the real estate
-- Purely news coverage without sale information
-
-Output JSON:
-{{
-    "is_listing": true/false,
-    "is_available": true/false,
-    "property_type": "college|camp|resort|hotel|retreat|other",
-    "classification": "qualified|interesting|dismissed",
-    "reason": "Brief explanation of classification",
-    "extracted_price": "$X,XXX,XXX or null",
-    "extracted_beds": number or null,
-    "extracted_acreage": number or null
-}}
-
-Classification rules:
-- "qualified": Is a listing AND is available
-- "interesting": Is news/article about a property that MIGHT become available
-- "dismissed": Already sold, not a property, or not relevant
+Description: {(prop.description or "")[:PROMPT_DESCRIPTION_CHARS]}
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text
+            data = await self._cached_generate("verify", prop, prompt, VERIFY_CACHE_TTL)
+            
+            # Update property with verification results
+            self._apply_verification(prop, data)
             
-            # Extract JSON from response
-            match = re.search(r'\{.*\}', text, re.DOTALL)
-            if match:
-                data = json.loads(match.group(0))
-                
-                # Update property with verification results
-                prop.verification_result = "available" if data.get("is_available") else "not_available"
-                prop.verification_reason = data.get("reason", "")
-                prop.funnel_stage = data.get("classification", "interesting")
-                prop.last_verified_at = datetime.now()
-                
-                # Update extracted data if available
-                if data.get("extracted_price"):
-                    prop.price = data["extracted_price"]
-                if data.get("extracted_beds"):
-                    prop.bed_count = data["extracted_beds"]
-                if data.get("extracted_acreage"):
-                    prop.acreage = data["extracted_acreage"]
-                    
         except Exception as e:
             print(f"Error verifying property {prop.title}: {e}")
             prop.verification_result = "error"
@@ -125,75 +429,253 @@ Classification rules:
             
         return prop
 
+    def _batch_chunks(self, props: List[Property]) -> List[List[Property]]:
+        """Split properties into chunks that fit one batched verification prompt."""
+        chunks = []
+        current = []
+        current_tokens = 0
+        for prop in props:
+            tokens = _estimate_tokens(self._batch_item(0, prop))
+            if current and (
+                len(current) >= VERIFY_BATCH_SIZE
+                or current_tokens + tokens > VERIFY_BATCH_MAX_TOKENS
+            ):
+                chunks.append(current)
+                current = []
+                current_tokens = 0
+            current.append(prop)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _batch_item(self, index: int, prop: Property) -> str:
+        return f"""
+[{index}]
+Property Title: {prop.title}
+URL: {prop.url}
+Source Type: {prop.source_type}
+Description: {(prop.description or "")[:400]}
+"""
+
+    async def _classify_batch(self, props: List[Property], sem: asyncio.Semaphore):
+        """
+        Classify several reachable properties with a single Gemini call.
+
+        Falls back to one call per property if the response can't be parsed.
+        Each Gemini call, batched or not, holds a slot of sem.
+        """
+        items = "".join(self._batch_item(i, p) for i, p in enumerate(props, 1))
+        prompt = f"""
+Verify these {len(props)} properties. Return a JSON array of {len(props)} verification objects, in the same order as the properties below.
+{items}"""
+
+        try:
+            response = await _limited(sem, asyncio.to_thread(
+                self._get_model("verify").generate_content,
+                prompt,
+                generation_config=VERIFY_BATCH_CONFIG,
+            ))
+            results = _parse_json(response.text, "[")
+            if (
+                not isinstance(results, list)
+                or len(results) != len(props)
+                or not all(isinstance(r, dict) for r in results)
+            ):
+                raise ValueError("batch response did not contain one object per property")
+        except Exception as e:
+            print(f"Batch verification failed for {len(props)} properties, retrying individually: {e}")
+            await asyncio.gather(*[_limited(sem, self._classify_property(p)) for p in props])
+            return
+
+        self.cache_stats["misses"] += len(props)
+        for prop, data in zip(props, results):
+            self._apply_verification(prop, data)
+            # Seed the per-property cache so later single verifications reuse this
+            self._cache.set(self._cache_key("verify", prop), orjson.dumps(data).decode(), expire=VERIFY_CACHE_TTL)
+
+    async def verify_properties_batch(
+        self,
+        props: List[Property],
+        sem: Optional[asyncio.Semaphore] = None
+    ) -> List[Property]:
+        """
+        Verify many properties, grouping Gemini calls into batches.
+
+        URL checks still run per property; properties with a cached
+        verification skip the batch and reuse it. URL checks and Gemini calls
+        each hold a slot of sem (16 slots if not given).
+        """
+        if sem is None:
+            sem = asyncio.Semaphore(16)
+        if not self._get_model("verify"):
+            print("WARNING: Gemini API key not found. Skipping verification.")
+            for prop in props:
+                prop.funnel_stage = "qualified"  # Assume qualified if no verification
+            return props
+
+        url_checks = await asyncio.gather(*[
+            _limited(sem, self._check_url_cached(p.url)) for p in props
+        ])
+
+        cached = []
+        pending = []
+        for prop, (url_accessible, url_status, answered) in zip(props, url_checks):
+            if not url_accessible:
+                self._mark_invalid_url(prop, url_status, answered)
+            elif self._cache_key("verify", prop) in self._cache:
+                cached.append(prop)
+            else:
+                pending.append(prop)
+
+        await asyncio.gather(
+            *[_limited(sem, self._classify_property(p)) for p in cached],
+            *[self._classify_batch(chunk, sem) for chunk in self._batch_chunks(pending)],
+        )
+        return props
+
     async def analyze_property(self, prop: Property) -> Property:
         """
         Performs a deep dive analysis on a verified property using Gemini.
         Generates a viability score and AI summary.
         """
-        if not self.model:
+        if not self._get_model("analyze"):
             return prop
 
         prompt = f"""
-You are an expert real estate analyst specializing in distressed assets (colleges, camps, resorts).
-Analyze this verified property lead and provide a structured summary.
-
 Property Title: {prop.title}
 URL: {prop.url}
 Location: {prop.location}
 Price: {prop.price}
-Description: {prop.description}
+Description: {(prop.description or "")[:PROMPT_DESCRIPTION_CHARS]}
 Verification: {prop.verification_reason}
-
-Task:
-1. Rate the "viability" score (0-100) for turning this into a co-living village for 200+ builders.
-2. Write a one-sentence "punchy" summary of why this is interesting.
-3. Extract any vital stats if apparent from context.
-
-Consider:
-- Capacity (200+ beds needed)
-- Drive time to major airport (<2 hours ideal)
-- Price point
-- Infrastructure condition
-
-Output JSON:
-{{
-    "score": <int 0-100>,
-    "ai_summary": "<one compelling sentence>",
-    "inferred_beds": <int or null>,
-    "inferred_acreage": <float or null>
-}}
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text
+            data = await self._cached_generate("analyze", prop, prompt, ANALYZE_CACHE_TTL)
             
-            match = re.search(r'\{.*\}', text, re.DOTALL)
-            if match:
-                data = json.loads(match.group(0))
-                
-                prop.score = data.get("score", prop.score)
-                prop.ai_summary = data.get("ai_summary", prop.ai_summary)
-                if data.get("inferred_beds") and not prop.bed_count:
-                    prop.bed_count = data.get("inferred_beds")
-                if data.get("inferred_acreage") and not prop.acreage:
-                    prop.acreage = data.get("inferred_acreage")
+            prop.score = data.get("score", prop.score)
+            prop.ai_summary = data.get("ai_summary", prop.ai_summary)
+            if data.get("inferred_beds") and not prop.bed_count:
+                prop.bed_count = data.get("inferred_beds")
+            if data.get("inferred_acreage") and not prop.acreage:
+                prop.acreage = data.get("inferred_acreage")
                     
         except Exception as e:
             print(f"Error analyzing property {prop.title}: {e}")
             
         return prop
 
+    def _claim(self, prop: Property) -> Tuple[bool, asyncio.Future]:
+        """
+        Register prop's URL as being verified by the caller.
+
+        Returns (True, future) if the caller now owns the URL and must release
+        it, or (False, future) if another task is already verifying it.
+        """
+        fut = self._inflight.get(prop.url)
+        if fut is not None:
+            return False, fut
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[prop.url] = fut
+        return True, fut
+
+    def _release(self, prop: Property, fut: asyncio.Future, result: Optional[Property]):
+        """Hand the outcome to anyone waiting on prop's URL (None if it failed)."""
+        if self._inflight.get(prop.url) is fut:
+            del self._inflight[prop.url]
+        if not fut.done():
+            fut.set_result(result)
+
+    async def _await_inflight(self, prop: Property, fut: asyncio.Future) -> bool:
+        """
+        Wait for another task's verification and copy it onto prop.
+
+        Returns False if that verification failed or was cancelled, so the
+        caller verifies on its own.
+        """
+        try:
+            # Shielded: cancelling one waiter must not cancel everyone's future
+            result = await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            if not fut.cancelled():
+                raise  # This waiter itself was cancelled
+            return False
+        except Exception:
+            return False
+        if result is None:
+            return False
+        for field in VERIFIED_FIELDS:
+            setattr(prop, field, getattr(result, field))
+        return True
+
     async def verify_and_analyze(self, prop: Property) -> Property:
         """Full pipeline: verify then analyze if qualified."""
-        # First verify
-        prop = await self.verify_property(prop)
-        
-        # Only analyze if qualified or interesting
-        if prop.funnel_stage in ['qualified', 'interesting']:
-            prop = await self.analyze_property(prop)
+        owner, fut = self._claim(prop)
+        if not owner and await self._await_inflight(prop, fut):
+            return prop
         
-        return prop
+        result = None
+        try:
+            # First verify
+            prop = await self.verify_property(prop)
+            
+            # Only analyze if qualified or interesting
+            if prop.funnel_stage in ['qualified', 'interesting']:
+                prop = await self.analyze_property(prop)
+            
+            result = prop
+            return prop
+        finally:
+            if owner:
+                self._release(prop, fut, result)
+
+    async def verify_and_analyze_batch(
+        self,
+        props: List[Property],
+        concurrency: int = 16,
+        on_result: Optional[Callable[[Property], None]] = None
+    ) -> List[Property]:
+        """
+        Full pipeline for many properties: batch verify, then analyze if qualified.
+
+        on_result, if given, is called with each property as soon as it is done.
+        Properties whose URL is already being verified elsewhere reuse that result.
+        """
+        owned = []
+        waiting = []
+        for prop in props:
+            owner, fut = self._claim(prop)
+            (owned if owner else waiting).append((prop, fut))
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def finish(prop: Property, fut: asyncio.Future):
+            if prop.funnel_stage in ['qualified', 'interesting']:
+                async with sem:
+                    await self.analyze_property(prop)
+            self._release(prop, fut, prop)
+            if on_result:
+                on_result(prop)
+
+        async def run_owned():
+            await self.verify_properties_batch([p for p, _ in owned], sem)
+            await _gather_or_cancel(*[finish(p, f) for p, f in owned])
+
+        async def follow(prop: Property, fut: asyncio.Future):
+            if not await self._await_inflight(prop, fut):
+                await _limited(sem, self.verify_and_analyze(prop))
+            if on_result:
+                on_result(prop)
+
+        try:
+            # If anything fails, nothing keeps running (and calling on_result) after we return
+            await _gather_or_cancel(run_owned(), *[follow(p, f) for p, f in waiting])
+        finally:
+            # Unblock waiters if anything above failed before finishing
+            for prop, fut in owned:
+                self._release(prop, fut, None)
+        return props
 
 
 analyst_agent = AnalystAgent()
@@ -6,6 +6,7 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str = ""
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
+    GEMINI_CACHE_DIR: str = "/tmp/gemini_cache"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,18 +1,68 @@
 """
 Supabase database layer for property persistence.
 """
-from typing import List, Optional, Set
-from supabase import create_client, Client
+import asyncio
+import threading
+import time
+import httpx
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from supabase import create_client, Client, ClientOptions
 from app.config import settings
-from app.models import Property
-from datetime import datetime
+from app.models import Property, PropertySummary
+
+# How long cached lookups (URLs, dismissed patterns) are reused, in seconds
+CACHE_TTL_SECONDS = 60
+
+# Upper bound on URLs loaded for deduplication
+MAX_DEDUP_URLS = 50000
+
+# Rows per PostgREST request in bulk upserts
+UPSERT_CHUNK_SIZE = 200
+
+
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
+
+def _client_options() -> ClientOptions:
+    """Client options sharing one keep-alive httpx client across PostgREST calls."""
+    # Match postgrest's own client (HTTP/2, redirects) so only pooling changes
+    http_client = httpx.Client(
+        timeout=30.0,
+        http2=True,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    )
+    # The timeout lives on http_client; postgrest_client_timeout is ignored with it
+    return ClientOptions(httpx_client=http_client)
 
 
 def get_supabase_client() -> Optional[Client]:
-    """Get Supabase client if credentials are configured."""
+    """Get the shared Supabase client if credentials are configured."""
+    global _client
     if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
         return None
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_KEY,
+                    options=_client_options()
+                )
+    return _client
+
+
+def _to_row(prop: Property) -> dict:
+    """
+    Serialize a property for upsert, with datetimes as ISO strings.
+    
+    New rows (no id yet) send the full record; existing rows send only the
+    fields that were explicitly set, leaving unchanged defaults out.
+    """
+    if prop.id is None:
+        return prop.model_dump(exclude_none=True, mode="json")
+    return prop.model_dump(exclude_unset=True, exclude_none=True, mode="json")
 
 
 class PropertyDatabase:
@@ -21,21 +71,48 @@ class PropertyDatabase:
     def __init__(self):
         self.client = get_supabase_client()
         self.table_name = "properties"
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_lock = asyncio.Lock()
     
     def is_available(self) -> bool:
         """Check if database is configured and available."""
         return self.client is not None
     
+    async def _exec(self, query):
+        """Run a query in a worker thread; supabase-py's client is synchronous."""
+        return await asyncio.to_thread(query.execute)
+    
+    async def _cached(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached value for key, reloading it once the TTL expires."""
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        
+        async with self._cache_lock:
+            # Another task may have refreshed it while we waited
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            value = await loader()
+            self._cache[key] = (time.monotonic() + CACHE_TTL_SECONDS, value)
+            return value
+    
+    def invalidate_cache(self):
+        """Drop cached lookups so the next read sees fresh data."""
+        self._cache.clear()
+    
     async def get_all_properties(
         self, 
         status_filter: Optional[str] = None,
-        funnel_filter: Optional[str] = None
-    ) -> List[Property]:
-        """Get all properties, optionally filtered by status or funnel stage."""
+        funnel_filter: Optional[str] = None,
+        limit: int = 200,
+        offset: int = 0
+    ) -> List[PropertySummary]:
+        """Get a page of properties, optionally filtered by status or funnel stage."""
         if not self.is_available():
             return []
         
-        query = self.client.table(self.table_name).select("*")
+        query = self.client.table(self.table_name).select(",".join(Property.list_fields()))
         
         if status_filter:
             query = query.eq("status", status_filter)
@@ -46,35 +123,63 @@ class PropertyDatabase:
             # By default, exclude dismissed
             query = query.neq("funnel_stage", "dismissed")
         
-        result = query.order("created_at", desc=True).execute()
+        result = await self._exec(query.order("created_at", desc=True).range(offset, offset + limit - 1))
+        
+        # Rows come from our own schema, so skip validation on the hot list path
+        return [PropertySummary.model_construct(**row) for row in result.data]
+    
+    async def _url_sets(self) -> Tuple[Set[str], Set[str]]:
+        """Stored property URLs, as-is and normalized, loaded together and cached."""
+        async def load() -> Tuple[Set[str], Set[str]]:
+            # Imported here so the database layer doesn't load the search SDKs up front
+            from app.scout.agent import normalize_url
+            result = await self._exec(self.client.table(self.table_name).select("url").order(
+                "created_at", desc=True
+            ).limit(MAX_DEDUP_URLS))
+            urls = {row["url"] for row in result.data if row.get("url")}
+            return urls, {normalize_url(url) for url in urls}
         
-        return [Property(**row) for row in result.data]
+        return await self._cached("urls", load)
     
     async def get_all_urls(self) -> Set[str]:
-        """Get all existing property URLs for deduplication."""
+        """
+        Get all existing property URLs for deduplication.
+        
+        The result is cached briefly and shared between callers; don't mutate it.
+        """
         if not self.is_available():
             return set()
+        return (await self._url_sets())[0]
+    
+    async def get_normalized_urls(self) -> Set[str]:
+        """
+        Get all existing property URLs normalized for deduplication (see normalize_url).
         
-        result = self.client.table(self.table_name).select("url").execute()
-        return {row["url"] for row in result.data if row.get("url")}
+        Cached together with get_all_urls; don't mutate the result.
+        """
+        if not self.is_available():
+            return set()
+        return (await self._url_sets())[1]
     
     async def get_dismissed_patterns(self) -> List[str]:
         """Get patterns from dismissed properties for filtering."""
         if not self.is_available():
             return []
         
-        result = self.client.table(self.table_name).select("dismissed_pattern").eq(
-            "funnel_stage", "dismissed"
-        ).not_.is_("dismissed_pattern", "null").execute()
+        async def load() -> List[str]:
+            result = await self._exec(self.client.table(self.table_name).select("dismissed_pattern").eq(
+                "funnel_stage", "dismissed"
+            ).not_.is_("dismissed_pattern", "null"))
+            return [row["dismissed_pattern"] for row in result.data if row.get("dismissed_pattern")]
         
-        return [row["dismissed_pattern"] for row in result.data if row.get("dismissed_pattern")]
+        return await self._cached("dismissed_patterns", load)
     
     async def get_property(self, property_id: str) -> Optional[Property]:
         """Get a single property by ID."""
         if not self.is_available():
             return None
         
-        result = self.client.table(self.table_name).select("*").eq("id", property_id).single().execute()
+        result = await self._exec(self.client.table(self.table_name).select("*").eq("id", property_id).single())
         
         if result.data:
             return Property(**result.data)
@@ -85,49 +190,48 @@ class PropertyDatabase:
         if not self.is_available():
             return prop
         
-        data = prop.model_dump(exclude_none=True)
-        
-        # Handle datetime serialization
-        if 'last_verified_at' in data and data['last_verified_at']:
-            data['last_verified_at'] = data['last_verified_at'].isoformat()
+        data = _to_row(prop)
         
-        result = self.client.table(self.table_name).upsert(
+        result = await self._exec(self.client.table(self.table_name).upsert(
             data, 
             on_conflict="url"  # Use URL as unique key
-        ).execute()
+        ))
+        self.invalidate_cache()
         
         if result.data:
             return Property(**result.data[0])
         return prop
     
     async def upsert_properties(self, properties: List[Property]) -> List[Property]:
-        """Bulk insert or update properties."""
+        """
+        Bulk insert or update properties.
+        
+        Rows are sent in chunks of UPSERT_CHUNK_SIZE in parallel.
+        """
         if not self.is_available():
             return properties
         
-        data = []
-        for p in properties:
-            d = p.model_dump(exclude_none=True)
-            # Handle datetime serialization
-            if 'last_verified_at' in d and d['last_verified_at']:
-                d['last_verified_at'] = d['last_verified_at'].isoformat()
-            data.append(d)
-        
-        result = self.client.table(self.table_name).upsert(
-            data,
-            on_conflict="url"
-        ).execute()
+        data = [_to_row(p) for p in properties]
+        chunks = [data[i:i + UPSERT_CHUNK_SIZE] for i in range(0, len(data), UPSERT_CHUNK_SIZE)]
+        results = await asyncio.gather(*[
+            self._exec(self.client.table(self.table_name).upsert(
+                chunk,
+                on_conflict="url"
+            ))
+            for chunk in chunks
+        ])
+        self.invalidate_cache()
         
-        return [Property(**row) for row in result.data]
+        return [Property(**row) for result in results for row in result.data]
     
     async def update_status(self, property_id: str, status: str) -> Optional[Property]:
         """Update the status of a property (Star, Archive, etc.)."""
         if not self.is_available():
             return None
         
-        result = self.client.table(self.table_name).update({
+        result = await self._exec(self.client.table(self.table_name).update({
             "status": status
-        }).eq("id", property_id).execute()
+        }).eq("id", property_id))
         
         if result.data:
             return Property(**result.data[0])
@@ -152,9 +256,10 @@ class PropertyDatabase:
         if pattern:
             update_data["dismissed_pattern"] = pattern
         
-        result = self.client.table(self.table_name).update(update_data).eq(
+        result = await self._exec(self.client.table(self.table_name).update(update_data).eq(
             "id", property_id
-        ).execute()
+        ))
+        self.invalidate_cache()
         
         if result.data:
             return Property(**result.data[0])
@@ -165,9 +270,9 @@ class PropertyDatabase:
         if not self.is_available():
             return None
         
-        result = self.client.table(self.table_name).update({
+        result = await self._exec(self.client.table(self.table_name).update({
             "is_new": False
-        }).eq("id", property_id).execute()
+        }).eq("id", property_id))
         
         if result.data:
             return Property(**result.data[0])
@@ -178,7 +283,8 @@ class PropertyDatabase:
         if not self.is_available():
             return False
         
-        self.client.table(self.table_name).delete().eq("id", property_id).execute()
+        await self._exec(self.client.table(self.table_name).delete().eq("id", property_id))
+        self.invalidate_cache()
         return True
 
 
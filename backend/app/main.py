@@ -1,19 +1,81 @@
+import asyncio
+import logging
+import sys
+import orjson
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
-from app.models import SearchResult, Property
+from app.models import SearchResult, SummaryResult, Property
 from app.database import property_db
 
+# Show INFO logs from app modules next to the prints; other libraries
+# (httpx logs every request at INFO) stay at the WARNING default
+logging.basicConfig(format="%(message)s")
+logging.getLogger("app").setLevel(logging.INFO)
+
 app = FastAPI(title="Edge City Finder API")
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "*"],  # Allow all for Railway
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Max number of properties analyzed by the Analyst at the same time
+VERIFY_CONCURRENCY = 16
+
+# Largest page the list endpoints serve. Supabase returns at most 1000 rows,
+# and each page fetches one extra row to fill in has_more
+MAX_PAGE_SIZE = 999
+
+# Tasks that must outlive the request that started them
+_background_tasks: set = set()
+
+# CORS is open to every origin (localhost and Railway), so the headers never
+# vary per request and can be built once
+CORS_HEADERS = [(b"access-control-allow-origin", b"*")]
+PREFLIGHT_HEADERS = CORS_HEADERS + [
+    (b"access-control-allow-methods", b"GET, POST, PUT, PATCH, DELETE, OPTIONS"),
+    (b"access-control-allow-headers", b"*"),
+    (b"access-control-max-age", b"600"),
+]
+
+
+class OpenCORSMiddleware:
+    """
+    ASGI middleware that allows all origins.
+    
+    Preflight requests are answered directly with a 204; other responses get
+    the precomputed CORS header appended.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        if scope["method"] == "OPTIONS" and any(
+            name == b"access-control-request-method" for name, _ in scope["headers"]
+        ):
+            await send({"type": "http.response.start", "status": 204, "headers": PREFLIGHT_HEADERS})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *CORS_HEADERS]
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+
+
+app.add_middleware(OpenCORSMiddleware)
+
+@app.on_event("shutdown")
+async def shutdown():
+    # The analyst is imported lazily; only close it if it was ever loaded
+    analyst_module = sys.modules.get("app.analyst.agent")
+    if analyst_module:
+        await analyst_module.analyst_agent.aclose()
+
 
 @app.get("/")
 def read_root():
@@ -25,41 +87,57 @@ def read_root():
 
 # ----------------- Property Endpoints -----------------
 
-@app.get("/api/properties", response_model=SearchResult)
+async def summary_page(
+    status_filter: Optional[str],
+    funnel_filter: Optional[str],
+    limit: int,
+    offset: int
+) -> SummaryResult:
+    """Load one page of property summaries, fetching a row extra to detect more pages."""
+    if not property_db.is_available():
+        # Fall back to empty if no database
+        return SummaryResult(properties=[])
+    
+    properties = await property_db.get_all_properties(
+        status_filter=status_filter,
+        funnel_filter=funnel_filter,
+        limit=limit + 1,
+        offset=offset
+    )
+    return SummaryResult(properties=properties[:limit], has_more=len(properties) > limit)
+
+
+@app.get("/api/properties", response_model=SummaryResult)
 async def get_properties(
     status: Optional[str] = None,
-    funnel_stage: Optional[str] = None
+    funnel_stage: Optional[str] = None,
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
     """
-    Get all properties, optionally filtered by status or funnel_stage.
-    """
-    if property_db.is_available():
-        properties = await property_db.get_all_properties(
-            status_filter=status,
-            funnel_filter=funnel_stage
-        )
-        return SearchResult(properties=properties)
+    Get a page of properties, optionally filtered by status or funnel_stage.
     
-    # Fall back to empty if no database
-    return SearchResult(properties=[])
+    has_more in the response says whether another page follows.
+    """
+    return await summary_page(status, funnel_stage, limit, offset)
 
 
-@app.get("/api/properties/qualified", response_model=SearchResult)
-async def get_qualified_leads():
+@app.get("/api/properties/qualified", response_model=SummaryResult)
+async def get_qualified_leads(
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
     """Get only qualified leads (actual listings that are available)."""
-    if property_db.is_available():
-        properties = await property_db.get_all_properties(funnel_filter="qualified")
-        return SearchResult(properties=properties)
-    return SearchResult(properties=[])
+    return await summary_page(None, "qualified", limit, offset)
 
 
-@app.get("/api/properties/interesting", response_model=SearchResult)
-async def get_interesting_finds():
+@app.get("/api/properties/interesting", response_model=SummaryResult)
+async def get_interesting_finds(
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
     """Get interesting finds (news/articles, not direct listings)."""
-    if property_db.is_available():
-        properties = await property_db.get_all_properties(funnel_filter="interesting")
-        return SearchResult(properties=properties)
-    return SearchResult(properties=[])
+    return await summary_page(None, "interesting", limit, offset)
 
 
 @app.get("/api/properties/{property_id}", response_model=Property)
@@ -122,6 +200,34 @@ class SearchRequest(BaseModel):
     verify: bool = True  # Run analyst verification
 
 
+async def find_new_candidates(request: Optional[SearchRequest]) -> List[Property]:
+    """Run the Scout and drop candidates that are already in the database."""
+    from app.scout.agent import scout_agent
+    
+    # Get existing URLs for deduplication
+    existing_urls = await property_db.get_normalized_urls()
+    
+    # Parse request
+    custom_query = request.query if request else None
+    categories = request.categories if request else None
+    
+    # Run scout; it skips anything already stored, so known properties never
+    # reach the (expensive) verification step
+    known_urls = []
+    properties = [
+        prop async for prop in scout_agent.find_candidates(
+            existing_urls=existing_urls,
+            custom_query=custom_query,
+            categories=categories,
+            on_known=known_urls.append
+        )
+    ]
+    if known_urls:
+        print(f"Skipping verification for {len(known_urls)} already-known properties")
+    
+    return properties
+
+
 @app.post("/api/scout/run", response_model=SearchResult)
 async def run_scout(request: Optional[SearchRequest] = None):
     """
@@ -132,23 +238,10 @@ async def run_scout(request: Optional[SearchRequest] = None):
     - categories: Which search categories to run
     - verify: Whether to run Gemini verification (default: true)
     """
-    from app.scout.agent import scout_agent
     from app.analyst.agent import analyst_agent
     
-    # Get existing URLs for deduplication
-    existing_urls = await property_db.get_all_urls()
-    
-    # Parse request
-    custom_query = request.query if request else None
-    categories = request.categories if request else None
     should_verify = request.verify if request else True
-    
-    # Run scout
-    properties = await scout_agent.find_candidates(
-        existing_urls=existing_urls,
-        custom_query=custom_query,
-        categories=categories
-    )
+    properties = await find_new_candidates(request)
     
     if not properties:
         return SearchResult(properties=[])
@@ -156,16 +249,16 @@ async def run_scout(request: Optional[SearchRequest] = None):
     # Run verification if enabled
     if should_verify:
         print(f"Verifying {len(properties)} properties with Analyst agent...")
-        verified_properties = []
-        for prop in properties:
-            try:
-                verified_prop = await analyst_agent.verify_and_analyze(prop)
-                verified_properties.append(verified_prop)
-            except Exception as e:
-                print(f"Error verifying {prop.title}: {e}")
-                prop.funnel_stage = "interesting"  # Default on error
-                verified_properties.append(prop)
-        properties = verified_properties
+        try:
+            properties = await analyst_agent.verify_and_analyze_batch(
+                properties,
+                concurrency=VERIFY_CONCURRENCY
+            )
+        except Exception as e:
+            print(f"Error verifying properties: {e}")
+            for prop in properties:
+                if prop.funnel_stage == "discovered":
+                    prop.funnel_stage = "interesting"  # Default on error
     
     # Save to database
     if property_db.is_available():
@@ -177,6 +270,76 @@ async def run_scout(request: Optional[SearchRequest] = None):
     return SearchResult(properties=properties)
 
 
+@app.post("/api/scout/stream")
+async def stream_scout(request: Optional[SearchRequest] = None):
+    """
+    Same as /api/scout/run, but streams results as Server-Sent Events.
+    
+    Each property is saved and sent as a `data:` event as soon as the Analyst
+    finishes with it; a final `done` event carries the total count.
+    """
+    from app.analyst.agent import analyst_agent
+    
+    should_verify = request.verify if request else True
+    properties = await find_new_candidates(request)
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    saves: List[asyncio.Task] = []
+    emitted: set = set()
+    
+    async def save(prop: Property):
+        if property_db.is_available():
+            try:
+                prop = await property_db.upsert_property(prop)
+            except Exception as e:
+                print(f"Error upserting property {prop.title}: {e}")
+        queue.put_nowait(prop)
+    
+    def on_result(prop: Property):
+        # Each property is saved and sent once, even if reported twice
+        if id(prop) in emitted:
+            return
+        emitted.add(id(prop))
+        saves.append(asyncio.create_task(save(prop)))
+    
+    async def produce():
+        try:
+            if should_verify and properties:
+                print(f"Verifying {len(properties)} properties with Analyst agent...")
+                await analyst_agent.verify_and_analyze_batch(
+                    properties,
+                    concurrency=VERIFY_CONCURRENCY,
+                    on_result=on_result
+                )
+            else:
+                for prop in properties:
+                    on_result(prop)
+        except Exception as e:
+            print(f"Error verifying properties: {e}")
+            for prop in properties:
+                if id(prop) not in emitted:
+                    if prop.funnel_stage == "discovered":
+                        prop.funnel_stage = "interesting"  # Default on error
+                    on_result(prop)
+        finally:
+            await asyncio.gather(*saves)
+            queue.put_nowait(None)
+    
+    # Keep a reference so the pipeline finishes even if the client disconnects
+    producer = asyncio.create_task(produce())
+    _background_tasks.add(producer)
+    producer.add_done_callback(_background_tasks.discard)
+    
+    async def events():
+        count = 0
+        while (prop := await queue.get()) is not None:
+            count += 1
+            yield b"data: " + orjson.dumps(prop.model_dump()) + b"\n\n"
+        yield b"event: done\ndata: " + orjson.dumps({"count": count}) + b"\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @app.post("/api/scout/search")
 async def manual_search(query: str = Query(..., description="Search query")):
     """
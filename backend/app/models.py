@@ -46,11 +46,43 @@ class Property(BaseModel):
     dismissed_reason: Optional[str] = None  # 'already_sold', 'not_relevant', etc.
     dismissed_pattern: Optional[str] = None  # Extracted pattern for future filtering
 
+    @classmethod
+    def list_fields(cls) -> List[str]:
+        """Columns needed to render a property in the portal list view."""
+        return list(PropertySummary.model_fields)
+
+
+class PropertySummary(BaseModel):
+    """Subset of Property returned by list endpoints."""
+    id: Optional[str] = None
+    title: str
+    url: str
+    price: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    status: str = "New"
+    score: int = 0
+    acreage: Optional[float] = None
+    bed_count: Optional[int] = None
+    nearest_airport: Optional[str] = None
+    drive_time_minutes: Optional[int] = None
+    ai_summary: Optional[str] = None
+    image_url: Optional[str] = None
+    funnel_stage: FunnelStage = "discovered"
+    is_new: bool = True
+    verification_reason: Optional[str] = None
+    source_type: Optional[str] = None
+
 
 class SearchResult(BaseModel):
     properties: List[Property]
 
 
+class SummaryResult(BaseModel):
+    properties: List[PropertySummary]
+    has_more: bool = False  # More rows exist past this page
+
+
 class VerificationResult(BaseModel):
     """Result from Analyst verification"""
     is_listing: bool
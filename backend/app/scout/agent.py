@@ -1,18 +1,49 @@
-from exa_py import Exa
+from exa_py import AsyncExa
 from tavily import TavilyClient
 from app.config import settings
 from app.models import Property
-from typing import List, Set, Optional
+from typing import Any, AsyncIterator, Callable, List, Optional, Set, Tuple
+import asyncio
 import datetime
+import logging
 import re
+import time
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
 
 # Common US state abbreviations for location extraction
-US_STATES = {
+US_STATES = frozenset({
     'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL',
     'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT',
     'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI',
     'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'
-}
+})
+
+# "City, ST" location mentions
+LOCATION_RE = re.compile(r'\b([A-Z][a-z]+(?:\s[A-Z][a-z]+)?),\s*([A-Z]{2})\b')
+
+# A bare state abbreviation as its own word, e.g. "... campus in VT for sale"
+STATE_RE = re.compile(r'(?<!\S)(' + '|'.join(sorted(US_STATES)) + r')(?=\s|$)')
+
+# Price mentions, tried in order: $X,XXX,XXX or $X.X million, then phrasings
+PRICE_RES = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'\$[\d,]+(?:\.\d+)?(?:\s*(?:million|M))?',
+        r'asking\s+\$[\d,]+',
+        r'listed\s+(?:at|for)\s+\$[\d,]+',
+    )
+]
+
+# Source type keywords in a URL: listing platforms, auction sites, news outlets
+SOURCE_TYPE_RE = re.compile(
+    r'(?P<listing>loopnet|crexi|landwatch|landsofamerica)'
+    r'|(?P<auction>auction\.com|ten-x|hubzu)'
+    r'|(?P<news>news|journal|times|post|herald|nytimes|wsj)',
+    re.IGNORECASE
+)
+SOURCE_TYPE_PRIORITY = ('listing', 'auction', 'news')
 
 # Search query categories with source tracking
 SEARCH_QUERIES = {
@@ -44,64 +75,73 @@ SEARCH_QUERIES = {
 }
 
 
+# Tavily queries run alongside the category queries for extra news coverage
+TAVILY_QUERIES = [
+    "college campus for sale closing 2025 2026",
+    "rural resort hotel foreclosure auction",
+    "summer camp property sale available",
+]
+
+# Max number of search API calls in flight at once
+SEARCH_CONCURRENCY = 8
+
+# Options shared by every Exa search; built once and never mutated
+EXA_CONTENTS = {"text": {"max_characters": 1500}}
+EXA_SEARCH_KWARGS = {"num_results": 5, "contents": EXA_CONTENTS}
+
+
+def extract_location(text: str, title: str) -> str:
+    """Extract location from title or text using patterns."""
+    # Title first: it's short and usually carries the location
+    # Pattern: "City, ST" or "City, State"
+    match = LOCATION_RE.search(title) or LOCATION_RE.search(text)
+    if match:
+        city, state = match.groups()
+        if state in US_STATES:
+            return f"{city}, {state}"
+
+    # Pattern: Just state abbreviation in context
+    match = STATE_RE.search(title) or STATE_RE.search(text)
+    if match:
+        return match.group(1)
+
+    return "Location Unknown"
+
+
+def extract_price(text: str) -> Optional[str]:
+    """Extract price from text."""
+    for pattern in PRICE_RES:
+        match = pattern.search(text)
+        if match:
+            return match.group(0)
+    return None
+
+
+@lru_cache(maxsize=1)
+def _start_date(hour: int) -> str:
+    """Start of the 90-day search window; cached per hour bucket of time.time()."""
+    return (datetime.datetime.now() - datetime.timedelta(days=90)).strftime("%Y-%m-%d")
+
+
+def normalize_url(url: str) -> str:
+    """Normalize URL for deduplication."""
+    base_url = url.split('?')[0].split('#')[0]
+    return base_url.rstrip('/')
+
+
 class ScoutAgent:
     def __init__(self):
-        self.exa = Exa(api_key=settings.EXA_API_KEY) if settings.EXA_API_KEY else None
+        # The async client keeps one connection pool for every query
+        self.exa = AsyncExa(api_key=settings.EXA_API_KEY) if settings.EXA_API_KEY else None
         self.tavily = TavilyClient(api_key=settings.TAVILY_API_KEY) if settings.TAVILY_API_KEY else None
 
-    def _extract_location(self, text: str, title: str) -> str:
-        """Extract location from title or text using patterns."""
-        combined = f"{title} {text}"
-        
-        # Pattern: "City, ST" or "City, State"
-        pattern = r'\b([A-Z][a-z]+(?:\s[A-Z][a-z]+)?),\s*([A-Z]{2})\b'
-        match = re.search(pattern, combined)
-        if match:
-            city, state = match.groups()
-            if state in US_STATES:
-                return f"{city}, {state}"
-        
-        # Pattern: Just state abbreviation in context
-        for state in US_STATES:
-            if f" {state} " in combined or combined.endswith(f" {state}"):
-                return state
-        
-        return "Location Unknown"
-    
-    def _extract_price(self, text: str) -> Optional[str]:
-        """Extract price from text."""
-        # Pattern: $X,XXX,XXX or $X.X million
-        patterns = [
-            r'\$[\d,]+(?:\.\d+)?(?:\s*(?:million|M))?',
-            r'asking\s+\$[\d,]+',
-            r'listed\s+(?:at|for)\s+\$[\d,]+',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(0)
-        return None
-
-    def _normalize_url(self, url: str) -> str:
-        """Normalize URL for deduplication."""
-        base_url = url.split('?')[0].split('#')[0]
-        return base_url.rstrip('/')
-    
     def _determine_source_type(self, url: str, discovered_via: str) -> str:
         """Determine if source is a listing, news, or auction."""
-        url_lower = url.lower()
-        
-        # Listing platforms
-        if any(site in url_lower for site in ['loopnet', 'crexi', 'landwatch', 'landsofamerica']):
-            return 'listing'
-        
-        # Auction sites
-        if any(site in url_lower for site in ['auction.com', 'ten-x', 'hubzu']):
-            return 'auction'
-        
-        # News sources
-        if any(site in url_lower for site in ['news', 'journal', 'times', 'post', 'herald', 'nytimes', 'wsj']):
-            return 'news'
+        # One pass over the URL; listing beats auction beats news on overlap
+        found = {match.lastgroup for match in SOURCE_TYPE_RE.finditer(url)}
+        for source_type in SOURCE_TYPE_PRIORITY:
+            if source_type in found:
+                return source_type
         
         # Based on discovery method
         if 'legal' in discovered_via or 'foreclosure' in discovered_via:
@@ -113,19 +153,23 @@ class ScoutAgent:
         self, 
         existing_urls: Set[str] = None,
         custom_query: Optional[str] = None,
-        categories: Optional[List[str]] = None
-    ) -> List[Property]:
+        categories: Optional[List[str]] = None,
+        on_known: Optional[Callable[[str], None]] = None
+    ) -> AsyncIterator[Property]:
         """
         Search for distressed properties using Exa.ai and Tavily.
         
+        Yields each new property as soon as the search that found it returns.
+        
         Args:
-            existing_urls: URLs already in database to skip
+            existing_urls: Normalized URLs (see normalize_url) already in database to skip
             custom_query: Optional manual search query
             categories: Which query categories to run ('platforms', 'news', 'distress')
+            on_known: Called once with each URL skipped because it's in existing_urls
         """
         if not self.exa:
-            print("WARNING: Exa API key not found. Returning empty list.")
-            return []
+            logger.warning("Exa API key not found. Returning no results.")
+            return
 
         if existing_urls is None:
             existing_urls = set()
@@ -134,9 +178,8 @@ class ScoutAgent:
             categories = ['platforms', 'news', 'distress']
 
         # Date range for recent content (last 3 months)
-        start_date = (datetime.datetime.now() - datetime.timedelta(days=90)).strftime("%Y-%m-%d")
+        start_date = _start_date(int(time.time() // 3600))
 
-        found_properties = []
         seen_urls: Set[str] = set()
         
         # Build query list
@@ -151,113 +194,159 @@ class ScoutAgent:
             if category in SEARCH_QUERIES:
                 queries_to_run.extend(SEARCH_QUERIES[category])
 
-        for query, discovered_via in queries_to_run:
-            try:
-                # Run Exa search
-                response = self.exa.search(
-                    query,
-                    num_results=5,
-                    start_published_date=start_date,
-                    contents={"text": {"max_characters": 1500}}
-                )
-                
-                for result in response.results:
-                    normalized_url = self._normalize_url(result.url)
-                    
-                    # Skip duplicates
-                    if normalized_url in existing_urls or normalized_url in seen_urls:
-                        print(f"Skipping duplicate: {normalized_url}")
+        # Run every Exa query (and Tavily, for additional coverage) concurrently,
+        # handling each response as soon as its search finishes
+        sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
+        searches = [
+            self._search(sem, "exa", query, discovered_via, start_date)
+            for query, discovered_via in queries_to_run
+        ]
+        if self.tavily and not custom_query:
+            searches += [
+                self._search(sem, "tavily", query, "tavily_news", start_date)
+                for query in TAVILY_QUERIES
+            ]
+        tasks = [asyncio.ensure_future(search) for search in searches]
+        found_count = 0
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                engine, query, discovered_via, response = await next_done
+
+                if engine == "exa":
+                    if isinstance(response, Exception):
+                        logger.warning("Error searching for '%s': %s", query, response)
                         continue
                     
-                    seen_urls.add(normalized_url)
-                    
-                    # Extract data
-                    text_content = result.text or ""
-                    location = self._extract_location(text_content, result.title or "")
-                    price = self._extract_price(text_content)
-                    source_type = self._determine_source_type(result.url, discovered_via)
-                    
-                    prop = Property(
-                        title=result.title or "Untitled Property",
-                        url=result.url,
-                        location=location,
-                        price=price,
-                        description=text_content[:500] + "..." if len(text_content) > 500 else text_content,
-                        status="New",
-                        score=50,
-                        image_url=getattr(result, 'image', None),
+                    # Fields shared by every result of this query
+                    base = {
+                        "status": "New",
+                        "score": 50,
                         # Funnel tracking
-                        funnel_stage="discovered",
-                        is_new=True,
-                        source_type=source_type,
-                        discovered_via=discovered_via,
-                        search_query=query,
-                    )
-                    found_properties.append(prop)
+                        "funnel_stage": "discovered",
+                        "is_new": True,
+                        "discovered_via": discovered_via,
+                        "search_query": query,
+                    }
+                        
+                    for result in response.results:
+                        normalized_url = normalize_url(result.url)
+                        
+                        # Skip duplicates
+                        if normalized_url in seen_urls:
+                            logger.debug("Skipping duplicate: %s", normalized_url)
+                            continue
+                        
+                        seen_urls.add(normalized_url)
+                        
+                        if normalized_url in existing_urls:
+                            logger.debug("Skipping known URL: %s", normalized_url)
+                            if on_known:
+                                on_known(result.url)
+                            continue
+                        
+                        # Extract data
+                        text_content = result.text or ""
+                        location = extract_location(text_content, result.title or "")
+                        price = extract_price(text_content)
+                        source_type = self._determine_source_type(result.url, discovered_via)
+                        
+                        # Values are built here from plain strings, so skip validation
+                        found_count += 1
+                        yield Property.model_construct(
+                            title=result.title or "Untitled Property",
+                            url=result.url,
+                            location=location,
+                            price=price,
+                            description=f"{text_content[:500]}..." if len(text_content) > 500 else text_content,
+                            image_url=getattr(result, 'image', None),
+                            source_type=source_type,
+                            **base
+                        )
+                else:
+                    if isinstance(response, Exception):
+                        logger.warning("Tavily error for '%s': %s", query, response)
+                        continue
                     
-            except Exception as e:
-                print(f"Error searching for '{query}': {e}")
-                continue
-        
-        # Also run Tavily for additional coverage
-        if self.tavily and not custom_query:
-            await self._search_tavily(found_properties, seen_urls, existing_urls)
+                    base = {
+                        "status": "New",
+                        "score": 50,
+                        "funnel_stage": "discovered",
+                        "is_new": True,
+                        "source_type": "news",
+                        "discovered_via": discovered_via,
+                        "search_query": query,
+                    }
+                        
+                    for result in response.get('results', []):
+                        url = result.get('url', '')
+                        normalized_url = normalize_url(url)
+                        
+                        if normalized_url in seen_urls:
+                            continue
+                        
+                        seen_urls.add(normalized_url)
+                        
+                        if normalized_url in existing_urls:
+                            if on_known:
+                                on_known(url)
+                            continue
+                        
+                        text_content = result.get('content') or ''
+                        title = result.get('title') or 'Untitled'
+                        
+                        found_count += 1
+                        yield Property.model_construct(
+                            title=title,
+                            url=url,
+                            location=extract_location(text_content, title),
+                            price=extract_price(text_content),
+                            description=f"{text_content[:500]}..." if len(text_content) > 500 else text_content,
+                            **base
+                        )
+        finally:
+            # The caller may stop iterating early; don't leave searches running
+            for task in tasks:
+                task.cancel()
 
-        print(f"Scout found {len(found_properties)} new unique properties")
-        return found_properties
+        logger.info("Scout found %d new unique properties", found_count)
     
-    async def _search_tavily(
-        self, 
-        found_properties: List[Property], 
-        seen_urls: Set[str],
-        existing_urls: Set[str]
-    ):
+    async def _search(
+        self,
+        sem: asyncio.Semaphore,
+        engine: str,
+        query: str,
+        discovered_via: str,
+        start_date: str
+    ) -> Tuple[str, str, str, Any]:
+        """Run one search, returning its tags with the response or the error raised."""
+        try:
+            if engine == "exa":
+                response = await self._search_exa(sem, query, start_date)
+            else:
+                response = await self._search_tavily(sem, query)
+        except Exception as e:
+            response = e
+        return engine, query, discovered_via, response
+    
+    async def _search_exa(self, sem: asyncio.Semaphore, query: str, start_date: str):
+        """Run one Exa search."""
+        async with sem:
+            return await self.exa.search(
+                query,
+                start_published_date=start_date,
+                **EXA_SEARCH_KWARGS
+            )
+    
+    async def _search_tavily(self, sem: asyncio.Semaphore, query: str) -> dict:
         """Additional search via Tavily for news coverage."""
-        tavily_queries = [
-            "college campus for sale closing 2025 2026",
-            "rural resort hotel foreclosure auction",
-            "summer camp property sale available",
-        ]
-        
-        for query in tavily_queries:
-            try:
-                response = self.tavily.search(
-                    query=query,
-                    search_depth="advanced",
-                    max_results=5
-                )
-                
-                for result in response.get('results', []):
-                    url = result.get('url', '')
-                    normalized_url = self._normalize_url(url)
-                    
-                    if normalized_url in existing_urls or normalized_url in seen_urls:
-                        continue
-                    
-                    seen_urls.add(normalized_url)
-                    
-                    text_content = result.get('content', '')
-                    title = result.get('title', 'Untitled')
-                    
-                    prop = Property(
-                        title=title,
-                        url=url,
-                        location=self._extract_location(text_content, title),
-                        price=self._extract_price(text_content),
-                        description=text_content[:500] + "..." if len(text_content) > 500 else text_content,
-                        status="New",
-                        score=50,
-                        funnel_stage="discovered",
-                        is_new=True,
-                        source_type="news",
-                        discovered_via="tavily_news",
-                        search_query=query,
-                    )
-                    found_properties.append(prop)
-                    
-            except Exception as e:
-                print(f"Tavily error for '{query}': {e}")
-                continue
+        async with sem:
+            return await asyncio.to_thread(
+                self.tavily.search,
+                query=query,
+                search_depth="advanced",
+                max_results=5
+            )
 
 
 scout_agent = ScoutAgent()
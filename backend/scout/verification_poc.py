@@ -2,34 +2,59 @@ import asyncio
 import httpx
 from typing import List, Optional
 
+# One pooled client for all checks so repeat hosts reuse TCP/TLS connections
+_CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+)
+
+# Pages are only scanned up to this size; listings mention the property early
+MAX_CONTENT_BYTES = 256 * 1024
+
 async def verify_url(url: str) -> bool:
     """
     Level 0 Check: Does the link actually work?
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.head(url, follow_redirects=True)
-            return response.status_code == 200
+        response = await _CLIENT.head(url)
+        return response.status_code == 200
     except Exception:
         return False
 
 async def verify_content_match(url: str, entity_name: str, keywords: List[str]) -> bool:
     """
     Level 0 Check: Does the page actually mention what we think it does?
+
+    Only the first MAX_CONTENT_BYTES of the page are read.
     """
+    entity_name = entity_name.lower()
+    keywords = [k.lower() for k in keywords]
+
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, follow_redirects=True)
-            content = response.text.lower()
-            
-            # 1. Check if entity name is present (fuzzy match logic would go here)
-            if entity_name.lower() not in content:
-                return False
-                
-            # 2. Check if at least one keyword is present
-            if not any(k.lower() in content for k in keywords):
-                return False
-                
-            return True
+        buf = bytearray()
+        async with _CLIENT.stream(
+            "GET", url, headers={"Range": f"bytes=0-{MAX_CONTENT_BYTES - 1}"}
+        ) as response:
+            async for chunk in response.aiter_bytes():
+                buf += chunk
+                if len(buf) >= MAX_CONTENT_BYTES:
+                    break
+        content = buf[:MAX_CONTENT_BYTES].decode("utf-8", "ignore").lower()
+
+        # 1. Check if entity name is present (fuzzy match logic would go here)
+        if entity_name not in content:
+            return False
+
+        # 2. Check if at least one keyword is present
+        if not any(k in content for k in keywords):
+            return False
+
+        return True
     except Exception:
         return False
+
+async def close():
+    """Close the shared HTTP client."""
+    await _CLIENT.aclose()
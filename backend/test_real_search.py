@@ -3,69 +3,34 @@ Real Search Test Script
 Runs Exa.ai and Tavily searches, verifies results, and outputs real properties.
 """
 import asyncio
+import logging
 import os
-import json
 import httpx
+import orjson
+from pathlib import Path
 from dotenv import load_dotenv
 from exa_py import Exa
 import datetime
+from app.scout.agent import extract_location, normalize_url
+from app.analyst.agent import analyst_agent
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 EXA_API_KEY = os.getenv("EXA_API_KEY")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
-# Common US state abbreviations for location extraction
-US_STATES = {
-    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL',
-    'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT',
-    'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI',
-    'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'
-}
-
-import re
-
-def extract_location(text: str, title: str) -> str:
-    """Extract location from title or text using patterns."""
-    combined = f"{title} {text}"
-    
-    # Pattern: "City, ST" or "City, State"
-    pattern = r'\b([A-Z][a-z]+(?:\s[A-Z][a-z]+)?),\s*([A-Z]{2})\b'
-    match = re.search(pattern, combined)
-    if match:
-        city, state = match.groups()
-        if state in US_STATES:
-            return f"{city}, {state}"
-    
-    # Pattern: Just state abbreviation in context
-    for state in US_STATES:
-        if f" {state} " in combined or combined.endswith(f" {state}"):
-            return state
-    
-    return "Location Unknown"
-
-
-async def verify_url(url: str) -> bool:
-    """Check if URL is accessible."""
-    try:
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            response = await client.head(url)
-            return response.status_code == 200
-    except Exception as e:
-        print(f"  URL verification failed: {e}")
-        return False
-
 
 async def search_exa() -> list:
     """Run Exa.ai search and return results."""
     if not EXA_API_KEY:
-        print("❌ EXA_API_KEY not found")
+        logger.error("❌ EXA_API_KEY not found")
         return []
     
-    print("\n" + "="*60)
-    print("🔍 RUNNING EXA.AI SEARCH")
-    print("="*60)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\n%s\n%s\n%s", "="*60, "🔍 RUNNING EXA.AI SEARCH", "="*60)
     
     exa = Exa(api_key=EXA_API_KEY)
     
@@ -91,7 +56,7 @@ async def search_exa() -> list:
     results = []
     
     for query in queries:
-        print(f"\n📝 Query: '{query}'")
+        logger.info("\n📝 Query: '%s'", query)
         try:
             # Using new Exa v2 API - search() now returns text by default
             response = exa.search(
@@ -101,7 +66,7 @@ async def search_exa() -> list:
                 contents={"text": {"max_characters": 1000}}
             )
             
-            print(f"   Found {len(response.results)} results")
+            logger.info("   Found %d results", len(response.results))
             
             for result in response.results:
                 results.append({
@@ -111,10 +76,10 @@ async def search_exa() -> list:
                     "text": (result.text or "")[:500],
                     "location": extract_location(result.text or "", result.title or "")
                 })
-                print(f"   ✓ {result.title[:60]}..." if result.title else "   ✓ Untitled")
+                logger.debug("   ✓ %.60s...", result.title or "Untitled")
                 
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            logger.error("   ❌ Error: %s", e)
             continue
     
     return results
@@ -123,12 +88,11 @@ async def search_exa() -> list:
 async def search_tavily() -> list:
     """Run Tavily search and return results."""
     if not TAVILY_API_KEY:
-        print("❌ TAVILY_API_KEY not found")
+        logger.error("❌ TAVILY_API_KEY not found")
         return []
     
-    print("\n" + "="*60)
-    print("🔍 RUNNING TAVILY SEARCH")
-    print("="*60)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\n%s\n%s\n%s", "="*60, "🔍 RUNNING TAVILY SEARCH", "="*60)
     
     queries = [
         "distressed college campus for sale bankruptcy",
@@ -140,7 +104,7 @@ async def search_tavily() -> list:
     
     async with httpx.AsyncClient(timeout=30.0) as client:
         for query in queries:
-            print(f"\n📝 Query: '{query}'")
+            logger.info("\n📝 Query: '%s'", query)
             try:
                 response = await client.post(
                     "https://api.tavily.com/search",
@@ -156,7 +120,7 @@ async def search_tavily() -> list:
                 data = response.json()
                 
                 tavily_results = data.get("results", [])
-                print(f"   Found {len(tavily_results)} results")
+                logger.info("   Found %d results", len(tavily_results))
                 
                 for item in tavily_results:
                     results.append({
@@ -166,10 +130,10 @@ async def search_tavily() -> list:
                         "text": item.get("content", "")[:500],
                         "location": extract_location(item.get("content", ""), item.get("title", ""))
                     })
-                    print(f"   ✓ {item.get('title', 'Untitled')[:60]}...")
+                    logger.debug("   ✓ %.60s...", item.get("title", "Untitled"))
                     
             except Exception as e:
-                print(f"   ❌ Error: {e}")
+                logger.error("   ❌ Error: %s", e)
                 continue
     
     return results
@@ -177,29 +141,36 @@ async def search_tavily() -> list:
 
 async def verify_results(results: list) -> list:
     """Verify each result URL is accessible."""
-    print("\n" + "="*60)
-    print("✅ VERIFYING RESULTS (checking URLs are real)")
-    print("="*60)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\n%s\n%s\n%s", "="*60, "✅ VERIFYING RESULTS (checking URLs are real)", "="*60)
     
-    verified = []
+    # Drop duplicates before dispatching so each URL is only checked once
+    unique_results = []
     seen_urls = set()
-    
     for result in results:
-        url = result["url"]
-        
-        # Skip duplicates
-        if url in seen_urls:
+        normalized_url = normalize_url(result["url"])
+        if normalized_url in seen_urls:
             continue
-        seen_urls.add(url)
-        
-        print(f"\n🔗 Checking: {url[:70]}...")
-        is_valid = await verify_url(url)
+        seen_urls.add(normalized_url)
+        unique_results.append(result)
+    
+    sem = asyncio.Semaphore(20)
+    
+    async def check(result: dict) -> tuple[bool, str]:
+        async with sem:
+            return await analyst_agent.verify_url(result["url"])
+    
+    checks = await asyncio.gather(*[check(r) for r in unique_results])
+    
+    verified = []
+    for result, (is_valid, status) in zip(unique_results, checks):
+        logger.debug("\n🔗 Checking: %.70s...", result["url"])
         
         if is_valid:
-            print("   ✓ URL is accessible")
+            logger.debug("   ✓ URL is accessible")
             verified.append(result)
         else:
-            print("   ✗ URL not accessible - skipping")
+            logger.info("   ✗ URL not accessible (%s) - skipping: %.70s", status, result["url"])
     
     return verified
 
@@ -221,6 +192,7 @@ async def main():
     
     # Verify results
     verified_results = await verify_results(all_results)
+    await analyst_agent.aclose()
     
     # Final output
     print("\n" + "="*60)
@@ -235,12 +207,14 @@ async def main():
         print(f"Description: {prop['text'][:200]}...")
     
     # Save to JSON for reference
-    with open("search_results.json", "w") as f:
-        json.dump(verified_results, f, indent=2)
+    Path("search_results.json").write_bytes(
+        orjson.dumps(verified_results, option=orjson.OPT_INDENT_2)
+    )
     print(f"\n💾 Results saved to search_results.json")
     
     return verified_results
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     asyncio.run(main())
@@ -27,6 +27,9 @@ interface Property {
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+// Rows requested per page from the list endpoints
+const PAGE_SIZE = 200;
+
 type TabType = 'qualified' | 'interesting';
 
 export default function Home() {
@@ -41,15 +44,17 @@ export default function Home() {
   const [activeTab, setActiveTab] = useState<TabType>('qualified');
   const [customQuery, setCustomQuery] = useState('');
   const [searchLoading, setSearchLoading] = useState(false);
+  const [hasMore, setHasMore] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
 
-  // Load properties based on active tab
-  const loadProperties = async (tab: TabType = activeTab) => {
+  // Load properties based on active tab; offset > 0 appends the next page
+  const loadProperties = async (tab: TabType = activeTab, offset: number = 0) => {
     try {
       const endpoint = tab === 'qualified'
         ? `${API_BASE_URL}/api/properties/qualified`
         : `${API_BASE_URL}/api/properties/interesting`;
 
-      const response = await fetch(endpoint);
+      const response = await fetch(`${endpoint}?limit=${PAGE_SIZE}&offset=${offset}`);
       if (!response.ok) throw new Error('Failed to fetch properties');
 
       const data = await response.json();
@@ -75,7 +80,16 @@ export default function Home() {
           verification_reason: prop.verification_reason || '',
           source_type: prop.source_type || 'news'
         }));
-        setProperties(props);
+        if (offset === 0) {
+          setProperties(props);
+        } else {
+          // Rows added since the last page can shift a duplicate into this one
+          setProperties(prev => {
+            const loadedIds = new Set(prev.map(p => p.id));
+            return [...prev, ...props.filter((p: Property) => !loadedIds.has(p.id))];
+          });
+        }
+        setHasMore(Boolean(data.has_more));
       }
     } catch (err) {
       console.error('Failed to load properties:', err);
@@ -164,6 +178,15 @@ export default function Home() {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      await loadProperties(activeTab, properties.length);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Filter properties based on search text
   const filteredProperties = properties.filter(prop =>
     filterText === '' ||
@@ -369,6 +392,18 @@ export default function Home() {
                 />
               ))
             )}
+            {hasMore && (
+              <div className="flex justify-center pt-4">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="px-4 py-2 bg-zinc-100 dark:bg-zinc-800 text-zinc-600 dark:text-zinc-400 rounded-lg text-sm font-medium hover:bg-zinc-200 disabled:opacity-50 flex items-center gap-2"
+                >
+                  {loadingMore && <Loader2 size={16} className="animate-spin" />}
+                  Load more
+                </button>
+              </div>
+            )}
           </div>
         )}
       </main>